@@ -25,13 +25,27 @@ Autor: Kaio
 
 from __future__ import annotations
 
+import hashlib
+import json
 from pathlib import Path
+from xml.sax.saxutils import escape
 
+import matplotlib
+
+# Saídas são apenas arquivos SVG: backend não interativo, sem inicializar Qt/Tk
+matplotlib.use("Agg")
+
+import numexpr as ne
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import matplotlib.pyplot as plt
 import seaborn as sns
 import matplotlib.font_manager as fm
-import statsmodels.formula.api as smf
+from matplotlib import cbook
+from numba import njit, prange
+from scipy import linalg, stats
 
 
 # =============================================================================
@@ -40,11 +54,37 @@ import statsmodels.formula.api as smf
 DATA_BREAK = "2023-05-01"
 COR_LINHA_POLITICA = "black"
 
+# Cores dos boxplots (as mesmas do sns.boxplot padrão: azul dessaturado e borda cinza)
+COR_BOXPLOT = "#5875a4"
+COR_BORDA_BOXPLOT = "#4c4c4c"
+
 TAMANHO_FONTE = 11
 CAMINHO_ARIAL = r"C:\Windows\Fonts\arial.ttf"  # Windows/Spyder: ajuste se necessário
 
+# Regressores comuns aos modelos de gasolina e diesel (a constante é adicionada no ajuste)
+VARIAVEIS_MODELO = ["tempo", "pos_2023", "tempo_pos", "brent_rs", "preco_dolar"]
+
+# Variáveis das tabelas descritivas, das correlações e das figuras 2–4
+COLS_ANALISE = ["preco_diesel", "preco_gasolina", "brent_rs", "preco_dolar"]
+
 ARQUIVO_DADOS = Path("dados_tcc_historico.xlsx")
 
+# Colunas obrigatórias da planilha e opções de leitura (datas e tipos definidos na leitura)
+COLUNAS_DADOS = {"data", "preco_diesel", "preco_gasolina", "preco_brent", "preco_dolar"}
+OPCOES_LEITURA_XLSX = {
+    "usecols": sorted(COLUNAS_DADOS),  # colunas extras da planilha não são lidas nem guardadas
+    "parse_dates": ["data"],
+    "dtype": {
+        "preco_diesel": "float64",
+        "preco_gasolina": "float64",
+        "preco_brent": "float64",
+        "preco_dolar": "float64",
+    },
+}
+
+# Metadado do cache Parquet com a assinatura das opções de leitura usadas
+CHAVE_ASSINATURA = b"tcc_opcoes_leitura"
+
 PASTA_SAIDA = Path("outputs")
 PASTA_FIGURAS = PASTA_SAIDA / "figuras"
 PASTA_TABELAS = PASTA_SAIDA / "tabelas"
@@ -98,9 +138,19 @@ def configurar_estilo() -> str:
     return fonte_padrao
 
 
-def salvar_svg(path_saida: Path) -> None:
-    """Salva a figura atual como SVG com recorte justo."""
-    plt.savefig(path_saida, format="svg", bbox_inches="tight")
+def salvar_svg(path_saida: Path, fig: plt.Figure) -> None:
+    """Salva a figura como SVG com recorte justo."""
+    fig.savefig(path_saida, format="svg", bbox_inches="tight")
+
+
+def preparar_figura(fig: plt.Figure, figsize: tuple[float, float]) -> plt.Axes:
+    """
+    Limpa e redimensiona a figura compartilhada pelos plots e devolve um eixo novo.
+    Reaproveitar a mesma figura evita recriar canvas e renderizador a cada gráfico.
+    """
+    fig.clf()
+    fig.set_size_inches(figsize)
+    return fig.add_subplot()
 
 
 def validar_colunas(df: pd.DataFrame, colunas: set[str]) -> None:
@@ -110,68 +160,346 @@ def validar_colunas(df: pd.DataFrame, colunas: set[str]) -> None:
         raise ValueError(f"Colunas ausentes no arquivo de dados: {faltando}")
 
 
+def assinatura_leitura() -> bytes:
+    """Assinatura das opções de leitura do xlsx, gravada nos metadados do cache Parquet."""
+    opcoes = json.dumps(OPCOES_LEITURA_XLSX, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(opcoes).hexdigest().encode("ascii")
+
+
+def carregar_dados(path: Path) -> pd.DataFrame:
+    """
+    Lê a base de dados, usando um cache Parquet ao lado do xlsx.
+    O cache é regenerado sempre que estiver ausente, mais antigo que o xlsx
+    ou gerado com outras opções de leitura.
+    """
+    cache = path.with_suffix(".parquet")
+    assinatura = assinatura_leitura()
+    if (
+        cache.exists()
+        and cache.stat().st_mtime >= path.stat().st_mtime
+        and (pq.read_schema(cache).metadata or {}).get(CHAVE_ASSINATURA) == assinatura
+    ):
+        return pd.read_parquet(cache, engine="pyarrow")
+
+    # Valida o cabeçalho antes de aplicar parse_dates/dtype: colunas ausentes geram
+    # o erro do próprio script, e não um erro interno do pandas
+    validar_colunas(pd.read_excel(path, nrows=0), COLUNAS_DADOS)
+
+    df = pd.read_excel(path, **OPCOES_LEITURA_XLSX)
+    # parse_dates não falha com valores inválidos: apenas mantém a coluna como texto
+    if not pd.api.types.is_datetime64_any_dtype(df["data"]):
+        raise ValueError("A coluna 'data' do arquivo de dados contém valores que não são datas.")
+
+    # O cache é só uma otimização: se não puder ser gravado, segue com os dados em memória
+    try:
+        tabela = pa.Table.from_pandas(df, preserve_index=False)
+        metadados = {**(tabela.schema.metadata or {}), CHAVE_ASSINATURA: assinatura}
+        pq.write_table(tabela.replace_schema_metadata(metadados), cache, compression="zstd")
+    except (OSError, pa.ArrowException) as erro:
+        print(f"Aviso: cache Parquet não gravado ({cache}): {erro}")
+    return df
+
+
 def criar_variaveis(df: pd.DataFrame) -> pd.DataFrame:
     """Cria variáveis de tempo, dummy pós-2023 e Brent convertido para R$."""
-    df = df.copy()
-    df["data"] = pd.to_datetime(df["data"])
+    # sort_values já devolve um novo DataFrame: não é preciso copiar a entrada
     df = df.sort_values("data").reset_index(drop=True)
 
-    df["tempo"] = range(1, len(df) + 1)
-    df["pos_2023"] = (df["data"] >= DATA_BREAK).astype(int)
-    df["tempo_pos"] = df["tempo"] * df["pos_2023"]
+    tempo = np.arange(1, len(df) + 1, dtype=np.int32)
+    # Datas já ordenadas: a quebra é localizada por busca binária (primeira data >= DATA_BREAK).
+    # sort_values põe datas ausentes (NaT) no fim; elas ficam fora do período pós.
+    n_validas = int(df["data"].notna().sum())
+    datas = df["data"].to_numpy()[:n_validas]
+    corte = np.searchsorted(datas, np.datetime64(DATA_BREAK), side="left")
+    pos = np.zeros(len(df), dtype=np.int8)
+    pos[corte:n_validas] = 1
+    df["tempo"] = tempo
+    df["pos_2023"] = pos
+    df["tempo_pos"] = tempo * pos
 
     # Brent convertido para reais (R$/barril)
-    df["brent_rs"] = df["preco_brent"] * df["preco_dolar"]
+    brent = df["preco_brent"].to_numpy(dtype=np.float64)
+    dolar = df["preco_dolar"].to_numpy(dtype=np.float64)
+    df["brent_rs"] = ne.evaluate("brent * dolar")
     return df
 
 
-def normalizar_0_1(df: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
-    """Cria colunas normalizadas (0–1) para uma lista de variáveis."""
-    df_norm = df.copy()
-    for col in cols:
-        denom = (df[col].max() - df[col].min())
-        df_norm[f"{col}_norm"] = (df[col] - df[col].min()) / denom if denom != 0 else 0.0
-    return df_norm
+@njit(parallel=True, cache=True)
+def estatisticas_colunas(a: np.ndarray, pos: np.ndarray) -> np.ndarray:
+    """
+    Percorre cada coluna de `a` uma única vez (colunas em paralelo) e devolve uma
+    matriz 6 x p com: mínimo, máximo, média pré, média pós, desvio-padrão pré e
+    desvio-padrão pós (ddof=1), separando os períodos pela máscara `pos`.
+    Valores ausentes (NaN) são ignorados, como em pandas.
+    Médias e variâncias usam o algoritmo de Welford (estável em uma passada).
+    """
+    n, p = a.shape
+    out = np.empty((6, p))
+    for j in prange(p):
+        mn = np.inf
+        mx = -np.inf
+        n0, media0, m2_0 = 0, 0.0, 0.0
+        n1, media1, m2_1 = 0, 0.0, 0.0
+        for i in range(n):
+            v = a[i, j]
+            if v != v:  # NaN
+                continue
+            if v < mn:
+                mn = v
+            if v > mx:
+                mx = v
+            if pos[i]:
+                n1 += 1
+                delta = v - media1
+                media1 += delta / n1
+                m2_1 += delta * (v - media1)
+            else:
+                n0 += 1
+                delta = v - media0
+                media0 += delta / n0
+                m2_0 += delta * (v - media0)
+        out[0, j] = mn if n0 + n1 > 0 else np.nan
+        out[1, j] = mx if n0 + n1 > 0 else np.nan
+        out[2, j] = media0 if n0 > 0 else np.nan
+        out[3, j] = media1 if n1 > 0 else np.nan
+        out[4, j] = np.sqrt(m2_0 / (n0 - 1)) if n0 > 1 else np.nan
+        out[5, j] = np.sqrt(m2_1 / (n1 - 1)) if n1 > 1 else np.nan
+    return out
 
 
-def tabela_como_figura_svg(df_tabela: pd.DataFrame, path_saida: Path, fonte: str) -> None:
-    """Renderiza tabela como figura e salva em SVG."""
-    fig, ax = plt.subplots(figsize=(12, 0.6 + 0.4 * len(df_tabela)))
-    ax.axis("off")
-
-    tabela_plot = ax.table(
-        cellText=df_tabela.values,
-        colLabels=df_tabela.columns,
-        rowLabels=df_tabela.index,
-        loc="center",
-        cellLoc="center",
+def normalizar_0_1(a: np.ndarray, est: np.ndarray, cols: list[str]) -> pd.DataFrame:
+    """
+    Normaliza (0–1) as colunas de `a` (uma por variável de `cols`), usando o mínimo
+    e o máximo já calculados em `est` (saída de `estatisticas_colunas`).
+    Retorna apenas as colunas `<col>_norm`.
+    """
+    mn, mx = est[0], est[1]
+    # Colunas constantes: denominador 1 faz a série normalizada valer 0
+    amplitude = np.where(mx > mn, mx - mn, 1.0)
+    return pd.DataFrame(
+        ne.evaluate("(a - mn) / amplitude"),
+        columns=[f"{col}_norm" for col in cols],
     )
-    tabela_plot.scale(1, 1.5)
 
-    for _, cell in tabela_plot.get_celld().items():
-        cell.get_text().set_fontname(fonte)
-        cell.get_text().set_fontsize(TAMANHO_FONTE)
 
-    plt.tight_layout()
-    plt.savefig(path_saida, format="svg", bbox_inches="tight")
-    plt.close(fig)
+def estatisticas_por_periodo(est: np.ndarray, pos: np.ndarray, cols: list[str]) -> pd.DataFrame:
+    """
+    Média e desvio-padrão de cada variável antes (pos_2023 = 0) e depois (pos_2023 = 1)
+    da intervenção, no mesmo formato de `groupby("pos_2023").agg(["mean", "std"])`,
+    a partir de `est` (saída de `estatisticas_colunas`).
+    """
+    n_pos = int(pos.sum())
+
+    linhas = {}
+    for periodo, n_obs, media, desvio in ((0, len(pos) - n_pos, est[2], est[4]), (1, n_pos, est[3], est[5])):
+        if n_obs:
+            linhas[periodo] = np.column_stack([media, desvio]).ravel()
+
+    return pd.DataFrame.from_dict(
+        linhas,
+        orient="index",
+        columns=pd.MultiIndex.from_product([cols, ["mean", "std"]]),
+    ).rename_axis("pos_2023")
+
+
+def mascara_pos(pos: np.ndarray) -> np.ndarray:
+    """
+    Converte a dummy pós-intervenção (booleana ou 0/1) em máscara booleana.
+    Necessário antes de usar `~pos`: em int8, `~` daria -1/-2 (índices), não o complemento.
+    """
+    return np.asarray(pos, dtype=bool)
+
+
+def correlacoes_por_periodo(
+    a: np.ndarray, pos: np.ndarray, cols: list[str]
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Matrizes de correlação de Pearson antes e depois da intervenção (pré, pós).
+    Com valores ausentes, cada par usa as observações completas do par (como `.corr()`).
+    """
+    pos = mascara_pos(pos)
+
+    def correlacao(bloco: np.ndarray) -> pd.DataFrame:
+        if np.isnan(bloco).any():
+            return pd.DataFrame(bloco, columns=cols).corr()
+        return pd.DataFrame(np.corrcoef(bloco, rowvar=False), index=cols, columns=cols)
+
+    return correlacao(a[~pos]), correlacao(a[pos])
+
+
+def montar_svg_tabela(df_tabela: pd.DataFrame, fonte: str) -> str:
+    """
+    Monta o SVG de uma tabela como uma grade de <rect>/<text>, sem passar pelo matplotlib.
+    Larguras de coluna são estimadas pelo número de caracteres (texto permanece editável).
+    """
+    rotulos_colunas = [str(c) for c in df_tabela.columns]
+    rotulos_linhas = [str(i) for i in df_tabela.index]
+    celulas = df_tabela.to_numpy().astype(str)
+
+    # Grade completa: linha 0 = cabeçalho, coluna 0 = rótulos das linhas
+    grade = [["", *rotulos_colunas]]
+    grade += [[rotulo, *linha] for rotulo, linha in zip(rotulos_linhas, celulas)]
+
+    largura_caractere = 0.6 * TAMANHO_FONTE
+    margem = TAMANHO_FONTE
+    altura_linha = 2 * TAMANHO_FONTE
+    larguras = [
+        max(len(linha[j]) for linha in grade) * largura_caractere + 2 * margem
+        for j in range(len(grade[0]))
+    ]
+    x_colunas = np.concatenate([[0.0], np.cumsum(larguras)])
+    largura_total = x_colunas[-1]
+    altura_total = altura_linha * len(grade)
+
+    elementos = []
+    for i, linha in enumerate(grade):
+        y = i * altura_linha
+        for j, texto in enumerate(linha):
+            if i == 0 and j == 0:
+                continue  # canto superior esquerdo fica vazio
+            x = x_colunas[j]
+            elementos.append(
+                f'<rect x="{x:.1f}" y="{y:.1f}" width="{larguras[j]:.1f}" height="{altura_linha:.1f}" '
+                f'fill="white" stroke="black" stroke-width="0.5"/>'
+            )
+            if not texto:
+                continue
+            if j == 0:  # rótulos das linhas alinhados à esquerda
+                x_texto, ancora = x + margem, "start"
+            else:
+                x_texto, ancora = x + larguras[j] / 2, "middle"
+            elementos.append(
+                f'<text x="{x_texto:.1f}" y="{y + altura_linha / 2:.1f}" text-anchor="{ancora}" '
+                f'dominant-baseline="central">{escape(texto)}</text>'
+            )
+
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" '
+        f'width="{largura_total:.1f}pt" height="{altura_total:.1f}pt" '
+        f'viewBox="-1 -1 {largura_total + 2:.1f} {altura_total + 2:.1f}" '
+        f'font-family="{escape(fonte)}" font-size="{TAMANHO_FONTE}">\n'
+        + "\n".join(elementos)
+        + "\n</svg>\n"
+    )
+
+
+def tabela_como_figura_svg(df_tabela: pd.DataFrame, path_saida: Path, fonte: str) -> None:
+    """Renderiza tabela e salva em SVG."""
+    path_saida.write_text(montar_svg_tabela(df_tabela, fonte), encoding="utf-8")
 
 
 def adicionar_r2_ajustado(tabela: pd.DataFrame, r2_adj: float) -> pd.DataFrame:
     """Adiciona uma linha de R² ajustado à tabela de coeficientes."""
-    out = tabela.copy()
-    nova_linha = {col: "" for col in out.columns}
-    nova_linha[out.columns[-1]] = round(r2_adj, 4)
-    out.loc["R² ajustado"] = nova_linha
-    return out
+    nova_linha = pd.DataFrame(
+        [[""] * (len(tabela.columns) - 1) + [round(r2_adj, 4)]],
+        index=["R² ajustado"],
+        columns=tabela.columns,
+    )
+    return pd.concat([tabela, nova_linha])
+
+
+# =============================================================================
+# MODELOS ECONOMÉTRICOS
+# =============================================================================
+def tabela_coeficientes(params: np.ndarray, bse: np.ndarray, gl_resid: float) -> pd.DataFrame:
+    """Monta a tabela de coeficientes no mesmo formato de `summary2().tables[1]`."""
+    # Coeficiente não identificado (posto incompleto) tem erro-padrão 0: t fica NaN
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_valores = params / bse
+    t_critico = stats.t.ppf(0.975, gl_resid)
+    return pd.DataFrame(
+        {
+            "Coef.": params,
+            "Std.Err.": bse,
+            "t": t_valores,
+            "P>|t|": 2 * stats.t.sf(np.abs(t_valores), gl_resid),
+            "[0.025": params - t_critico * bse,
+            "0.975]": params + t_critico * bse,
+        },
+        index=["Intercept", *VARIAVEIS_MODELO],
+    )
+
+
+def estimar_modelos(df: pd.DataFrame, alvos: list[str]) -> dict[str, tuple[pd.DataFrame, float]]:
+    """
+    Estima por OLS um modelo por variável dependente em `alvos`
+    (todos com os regressores de VARIAVEIS_MODELO + constante).
+    Como no formula API (Patsy), cada modelo usa apenas as linhas sem valores ausentes
+    nos regressores e na sua variável dependente; alvos com o mesmo conjunto de linhas
+    completas são estimados em um único ajuste.
+    Retorna, para cada alvo, a tabela de coeficientes e o R² ajustado.
+    """
+    regressores_completos = df[VARIAVEIS_MODELO].notna().all(axis=1).to_numpy()
+
+    grupos: dict[bytes, tuple[np.ndarray, list[str]]] = {}
+    for alvo in alvos:
+        linhas = regressores_completos & df[alvo].notna().to_numpy()
+        grupos.setdefault(linhas.tobytes(), (linhas, []))[1].append(alvo)
+
+    modelos = {}
+    for linhas, alvos_grupo in grupos.values():
+        modelos.update(ajustar_ols(df[linhas], alvos_grupo))
+    return {alvo: modelos[alvo] for alvo in alvos}
+
+
+def ajustar_ols(df: pd.DataFrame, alvos: list[str]) -> dict[str, tuple[pd.DataFrame, float]]:
+    """
+    Ajusta, em uma única decomposição, os modelos de todos os `alvos` sobre as mesmas
+    linhas de `df` (que não devem conter valores ausentes).
+    """
+    # Matrizes NumPy float64 prontas para o LAPACK; a 1ª coluna de X é a constante
+    regressores = df[VARIAVEIS_MODELO].to_numpy(dtype=np.float64)
+    X = np.column_stack([np.ones(len(regressores)), regressores])
+    X = np.asfortranarray(X, dtype=np.float64)  # layout por coluna evita cópia interna no LAPACK
+    Y = df[alvos].to_numpy(dtype=np.float64)
+
+    # Uma única decomposição QR de X serve aos dois alvos (coeficientes e covariância):
+    # R β = Q'Y é resolvido de uma vez, com uma coluna de Y por modelo
+    Q, R = linalg.qr(X, mode="economic")
+    n_obs, n_params = X.shape
+
+    # Posto incompleto (ex.: nenhuma observação após DATA_BREAK zera pos_2023 e tempo_pos)
+    diag_r = np.abs(np.diag(R))
+    tolerancia = max(n_obs, n_params) * np.finfo(np.float64).eps * diag_r.max()
+    if (diag_r > tolerancia).all():
+        params = linalg.solve_triangular(R, Q.T @ Y)
+        gl_resid = n_obs - n_params
+        # diag((X'X)^-1) = diag(R^-1 R^-T) = soma dos quadrados das linhas de R^-1
+        R_inv = linalg.solve_triangular(R, np.eye(n_params))
+        diag_cov = (R_inv ** 2).sum(axis=1)
+    else:
+        colineares = [nome for nome, d in zip(["Intercept", *VARIAVEIS_MODELO], diag_r) if d <= tolerancia]
+        print(
+            "Aviso: matriz de regressores com posto incompleto (colunas linearmente dependentes: "
+            f"{colineares}); usando a solução de mínimos quadrados de norma mínima."
+        )
+        # Como o statsmodels (pinv): solução de norma mínima e covariância pela pseudo-inversa
+        params, _, posto, _ = linalg.lstsq(X, Y, lapack_driver="gelsy")
+        gl_resid = n_obs - posto
+        diag_cov = (linalg.pinv(X) ** 2).sum(axis=1)
+
+    residuos = Y - X @ params
+    ssr = (residuos ** 2).sum(axis=0)
+    sst = ((Y - Y.mean(axis=0)) ** 2).sum(axis=0)
+    escala = ssr / gl_resid
+    r2_ajustado = 1 - escala / (sst / (n_obs - 1))
+
+    modelos = {}
+    for k, alvo in enumerate(alvos):
+        bse = np.sqrt(diag_cov * escala[k])
+        modelos[alvo] = (
+            tabela_coeficientes(params[:, k], bse, gl_resid),
+            float(r2_ajustado[k]),
+        )
+    return modelos
 
 
 # =============================================================================
 # PLOTS
 # =============================================================================
-def plot_figura_1_series_nivel(df: pd.DataFrame) -> None:
+def plot_figura_1_series_nivel(df: pd.DataFrame, fig: plt.Figure) -> None:
     """Figura 1 — Séries temporais em nível (diesel, gasolina, câmbio e brent em eixo secundário)."""
-    fig, ax1 = plt.subplots(figsize=(14, 6))
+    ax1 = preparar_figura(fig, (14, 6))
     ax1.set_xlabel("Data")
     ax1.set_ylabel("R$/L ou R$/US$")
 
@@ -197,64 +525,101 @@ def plot_figura_1_series_nivel(df: pd.DataFrame) -> None:
     lines2, labels2 = ax2.get_legend_handles_labels()
     ax1.legend(lines1 + lines2, labels1 + labels2, loc="upper left")
 
-    plt.tight_layout()
-    salvar_svg(PASTA_FIGURAS / "Figura_1_series_nivel.svg")
-    plt.close(fig)
+    fig.tight_layout()
+    salvar_svg(PASTA_FIGURAS / "Figura_1_series_nivel.svg", fig)
 
 
-def plot_figura_2_series_normalizadas(df: pd.DataFrame) -> None:
+def plot_figura_2_series_normalizadas(df: pd.DataFrame, df_norm: pd.DataFrame, fig: plt.Figure) -> None:
     """Figura 2 — Séries normalizadas (0–1)."""
-    df_norm = normalizar_0_1(df, ["preco_diesel", "preco_gasolina", "brent_rs", "preco_dolar"])
-
-    fig = plt.figure(figsize=(14, 6))
-    sns.lineplot(data=df_norm, x="data", y="preco_diesel_norm", label="Diesel S10 (R$/L)")
-    sns.lineplot(data=df_norm, x="data", y="preco_gasolina_norm", label="Gasolina A (R$/L)")
-    sns.lineplot(data=df_norm, x="data", y="brent_rs_norm", label="Brent (R$/barril)")
-    sns.lineplot(data=df_norm, x="data", y="preco_dolar_norm", label="Câmbio (R$/US$)")
-
-    plt.axvline(
+    ax = preparar_figura(fig, (14, 6))
+    datas = df["data"].to_numpy()
+    series = [
+        ("preco_diesel_norm", "Diesel S10 (R$/L)"),
+        ("preco_gasolina_norm", "Gasolina A (R$/L)"),
+        ("brent_rs_norm", "Brent (R$/barril)"),
+        ("preco_dolar_norm", "Câmbio (R$/US$)"),
+    ]
+    for col, rotulo in series:
+        valores = df_norm[col].to_numpy()
+        # Como no sns.lineplot: pontos ausentes são omitidos e a linha liga as observações vizinhas
+        observados = ~np.isnan(valores) & ~np.isnat(datas)
+        ax.plot(datas[observados], valores[observados], label=rotulo)
+
+    ax.axvline(
         pd.to_datetime(DATA_BREAK),
         color=COR_LINHA_POLITICA,
         linestyle="--",
         label="Mudança de Política (Mai/23)",
     )
 
-    plt.xlabel("Data")
-    plt.ylabel("Valor normalizado (0–1)")
-    plt.grid(False)
-    plt.legend()
+    ax.set_xlabel("Data")
+    ax.set_ylabel("Valor normalizado (0–1)")
+    ax.grid(False)
+    ax.legend()
 
-    plt.tight_layout()
-    salvar_svg(PASTA_FIGURAS / "Figura_2_series_normalizadas.svg")
-    plt.close(fig)
+    fig.tight_layout()
+    salvar_svg(PASTA_FIGURAS / "Figura_2_series_normalizadas.svg", fig)
+
+
+def estatisticas_boxplot(a: np.ndarray, pos: np.ndarray, cols: list[str]) -> dict[str, list[dict]]:
+    """
+    Calcula uma única vez as estatísticas de boxplot (quartis, bigodes, outliers)
+    de cada variável, antes e depois da intervenção, no formato aceito por `Axes.bxp`.
+    Valores ausentes são descartados, como no `sns.boxplot`.
+    """
+    pos = mascara_pos(pos)
+    estatisticas = {}
+    for j, col in enumerate(cols):
+        valores = a[:, j]
+        observados = ~np.isnan(valores)  # boxplot_stats não aceita valores ausentes
+        estatisticas[col] = cbook.boxplot_stats(
+            [valores[~pos & observados], valores[pos & observados]]
+        )
+    return estatisticas
+
+
+def desenhar_boxplot_periodos(ax: plt.Axes, estatisticas: list[dict]) -> None:
+    """Desenha os boxplots pré (x=0) e pós (x=1) a partir de estatísticas já calculadas."""
+    ax.bxp(
+        estatisticas,
+        positions=[0, 1],
+        widths=0.8,
+        capwidths=0.4,
+        patch_artist=True,
+        manage_ticks=False,
+        boxprops={"facecolor": COR_BOXPLOT, "edgecolor": COR_BORDA_BOXPLOT},
+        medianprops={"color": COR_BORDA_BOXPLOT, "solid_capstyle": "butt"},
+        whiskerprops={"color": COR_BORDA_BOXPLOT, "solid_capstyle": "butt"},
+        capprops={"color": COR_BORDA_BOXPLOT},
+        flierprops={"markeredgecolor": COR_BORDA_BOXPLOT},
+    )
+    ax.set_xlim(-0.5, 1.5)
 
 
-def plot_figura_3_boxplot_diesel(df: pd.DataFrame) -> None:
+def plot_figura_3_boxplot_diesel(estatisticas: list[dict], fig: plt.Figure) -> None:
     """Figura 3 — Boxplot do Diesel (pré vs pós)."""
-    fig = plt.figure(figsize=(10, 6))
-    sns.boxplot(data=df, x="pos_2023", y="preco_diesel")
-    plt.xticks([0, 1], ["Antes de Mai/23", "Depois de Mai/23"])
-    plt.xlabel("Período")
-    plt.ylabel("Preço do Diesel (R$/litro)")
-    plt.grid(False)
-
-    plt.tight_layout()
-    salvar_svg(PASTA_FIGURAS / "Figura_3_boxplot_diesel.svg")
-    plt.close(fig)
+    ax = preparar_figura(fig, (10, 6))
+    desenhar_boxplot_periodos(ax, estatisticas)
+    ax.set_xticks([0, 1], ["Antes de Mai/23", "Depois de Mai/23"])
+    ax.set_xlabel("Período")
+    ax.set_ylabel("Preço do Diesel (R$/litro)")
+    ax.grid(False)
+
+    fig.tight_layout()
+    salvar_svg(PASTA_FIGURAS / "Figura_3_boxplot_diesel.svg", fig)
 
 
-def plot_figura_4_boxplot_gasolina(df: pd.DataFrame) -> None:
+def plot_figura_4_boxplot_gasolina(estatisticas: list[dict], fig: plt.Figure) -> None:
     """Figura 4 — Boxplot da Gasolina (pré vs pós)."""
-    fig = plt.figure(figsize=(10, 6))
-    sns.boxplot(data=df, x="pos_2023", y="preco_gasolina")
-    plt.xticks([0, 1], ["Antes de Mai/23", "Depois de Mai/23"])
-    plt.xlabel("Período")
-    plt.ylabel("Preço da Gasolina (R$/litro)")
-    plt.grid(False)
-
-    plt.tight_layout()
-    salvar_svg(PASTA_FIGURAS / "Figura_4_boxplot_gasolina.svg")
-    plt.close(fig)
+    ax = preparar_figura(fig, (10, 6))
+    desenhar_boxplot_periodos(ax, estatisticas)
+    ax.set_xticks([0, 1], ["Antes de Mai/23", "Depois de Mai/23"])
+    ax.set_xlabel("Período")
+    ax.set_ylabel("Preço da Gasolina (R$/litro)")
+    ax.grid(False)
+
+    fig.tight_layout()
+    salvar_svg(PASTA_FIGURAS / "Figura_4_boxplot_gasolina.svg", fig)
 
 
 # =============================================================================
@@ -264,59 +629,50 @@ def main() -> None:
     preparar_pastas()
     fonte_usada = configurar_estilo()
 
-    df = pd.read_excel(ARQUIVO_DADOS)
+    df = carregar_dados(ARQUIVO_DADOS)
 
-    validar_colunas(df, {
-        "data",
-        "preco_diesel",
-        "preco_gasolina",
-        "preco_brent",
-        "preco_dolar",
-    })
+    validar_colunas(df, COLUNAS_DADOS)
 
     df = criar_variaveis(df)
 
+    # Variáveis de análise e máscara pós-intervenção extraídas uma única vez,
+    # reaproveitadas por todas as tabelas e figuras abaixo
+    arr = np.ascontiguousarray(df[COLS_ANALISE].to_numpy(dtype=np.float64))
+    pos = df["pos_2023"].to_numpy(dtype=np.bool_)
+    est = estatisticas_colunas(arr, pos)  # mín./máx. e momentos pré/pós em uma passada
+
     # -------------------------
     # Modelos econométricos (OLS)
     # -------------------------
-    modelo_gasolina = smf.ols(
-        "preco_gasolina ~ tempo + pos_2023 + tempo_pos + brent_rs + preco_dolar",
-        data=df,
-    ).fit()
-
-    modelo_diesel = smf.ols(
-        "preco_diesel ~ tempo + pos_2023 + tempo_pos + brent_rs + preco_dolar",
-        data=df,
-    ).fit()
+    modelos = estimar_modelos(df, ["preco_gasolina", "preco_diesel"])
+    coef_gasolina, r2_adj_gasolina = modelos["preco_gasolina"]
+    coef_diesel, r2_adj_diesel = modelos["preco_diesel"]
 
     # -------------------------
     # Figuras (SVG)
     # -------------------------
-    plot_figura_1_series_nivel(df)
-    plot_figura_2_series_normalizadas(df)
-    plot_figura_3_boxplot_diesel(df)
-    plot_figura_4_boxplot_gasolina(df)
+    df_norm = normalizar_0_1(arr, est, COLS_ANALISE)
+
+    cols_boxplot = ["preco_diesel", "preco_gasolina"]
+    stats_boxplot = estatisticas_boxplot(
+        arr[:, [COLS_ANALISE.index(col) for col in cols_boxplot]], pos, cols_boxplot
+    )
+
+    fig = plt.figure()  # uma única figura, reaproveitada pelas quatro
+    plot_figura_1_series_nivel(df, fig)
+    plot_figura_2_series_normalizadas(df, df_norm, fig)
+    plot_figura_3_boxplot_diesel(stats_boxplot["preco_diesel"], fig)
+    plot_figura_4_boxplot_gasolina(stats_boxplot["preco_gasolina"], fig)
+    plt.close(fig)
 
     # -------------------------
     # Tabelas 1–3 (SVG)
     # -------------------------
-    tabela1 = (
-        df.groupby("pos_2023")[["preco_diesel", "preco_gasolina", "brent_rs", "preco_dolar"]]
-        .agg(["mean", "std"])
-        .round(3)
-    )
+    tabela1 = estatisticas_por_periodo(est, pos, COLS_ANALISE).round(3)
 
-    tabela2 = (
-        df[df["pos_2023"] == 0][["preco_diesel", "preco_gasolina", "brent_rs", "preco_dolar"]]
-        .corr()
-        .round(3)
-    )
-
-    tabela3 = (
-        df[df["pos_2023"] == 1][["preco_diesel", "preco_gasolina", "brent_rs", "preco_dolar"]]
-        .corr()
-        .round(3)
-    )
+    corr_pre, corr_pos = correlacoes_por_periodo(arr, pos, COLS_ANALISE)
+    tabela2 = corr_pre.round(3)
+    tabela3 = corr_pos.round(3)
 
     tabela_como_figura_svg(tabela1, PASTA_TABELAS / "Tabela_1_estatisticas_descritivas.svg", fonte_usada)
     tabela_como_figura_svg(tabela2, PASTA_TABELAS / "Tabela_2_correlacoes_pre.svg", fonte_usada)
@@ -325,11 +681,8 @@ def main() -> None:
     # -------------------------
     # Tabelas 4–5 (Regressões + R² ajustado) (SVG)
     # -------------------------
-    tabela4 = modelo_gasolina.summary2().tables[1].round(4)
-    tabela5 = modelo_diesel.summary2().tables[1].round(4)
-
-    tabela4 = adicionar_r2_ajustado(tabela4, modelo_gasolina.rsquared_adj)
-    tabela5 = adicionar_r2_ajustado(tabela5, modelo_diesel.rsquared_adj)
+    tabela4 = adicionar_r2_ajustado(coef_gasolina.round(4), r2_adj_gasolina)
+    tabela5 = adicionar_r2_ajustado(coef_diesel.round(4), r2_adj_diesel)
 
     tabela_como_figura_svg(tabela4, PASTA_TABELAS / "Tabela_4_regressao_gasolina.svg", fonte_usada)
     tabela_como_figura_svg(tabela5, PASTA_TABELAS / "Tabela_5_regressao_diesel.svg", fonte_usada)